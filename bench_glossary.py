@@ -0,0 +1,144 @@
+"""
+용어집 처리량 벤치마크 (기본 10,000개 용어)
+
+    python bench_glossary.py [--entries 10000] [--drafts 2000]
+
+Aho-Corasick 매처(glossary.Matcher)와, 용어마다 정규식을 하나씩 적용하는 단순 방식을 비교합니다.
+Draft 문장은 live_translate.py가 0.5초마다 만드는 것과 비슷한 길이(약 30단어)로 생성합니다.
+"""
+import argparse
+import os
+import random
+import re
+import string
+import tempfile
+import time
+
+from glossary import Glossary, Matcher
+
+
+def make_entries(n, rng):
+    entries = []
+    seen = set()
+    while len(entries) < n:
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(rng.randint(1, 3))]
+        term = " ".join(w.capitalize() for w in words)
+        if term.lower() in seen:
+            continue
+        seen.add(term.lower())
+        aliases = [" ".join(words).replace("e", "a", 1)] if rng.random() < 0.5 else []
+        entries.append((term, f"용어{len(entries)}", aliases))
+    return entries
+
+
+def make_drafts(n, entries, rng):
+    filler = "so the team will review our budget and the roadmap for next quarter before we ship".split()
+    drafts = []
+    for _ in range(n):
+        words = rng.choices(filler, k=28)
+        for _ in range(2):
+            term, _, aliases = rng.choice(entries)
+            words.insert(rng.randrange(len(words)), rng.choice([term.lower()] + aliases))
+        drafts.append(" ".join(words))
+    return drafts
+
+
+def bench(label, fn, drafts):
+    start = time.perf_counter()
+    for text in drafts:
+        fn(text)
+    elapsed = time.perf_counter() - start
+    chars = sum(len(t) for t in drafts)
+    print(f"{label:<28} {elapsed / len(drafts) * 1e6:>10.1f} µs/draft {len(drafts) / elapsed:>10.0f} drafts/s "
+          f"{chars / elapsed / 1e6:>8.2f} MB/s")
+    return elapsed / len(drafts)
+
+
+def write_glossary(path, entries):
+    with open(path, "w", encoding="utf-8") as f:
+        for term, ko, aliases in entries:
+            f.write(f"{term}\t{ko}\t{'|'.join(aliases)}\n")
+
+
+def bench_prompt_and_reload(entries, drafts, repeat=2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "glossary.txt")
+        write_glossary(path, entries)
+        glossary = Glossary(path, reload_interval=0.0)
+        for text in drafts[:100]:
+            glossary.fix_transcript(text)
+
+        # 0.5초마다 호출되는 프롬프트 생성 비용 (용어집 크기와 무관해야 함)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            glossary.prompt()
+        print(f"{'prompt() (hotwords)':<28} {(time.perf_counter() - start) / repeat * 1e6:>10.1f} µs/call")
+
+        # 파일 수정 후 처리 스레드가 maybe_reload() + 교정을 계속하는 동안 가장 오래 멈춘 시간
+        write_glossary(path, entries[:-1])
+        os.utime(path, (time.time() + 1, time.time() + 1))
+        start = time.perf_counter()
+        longest = 0.0
+        i = 0
+        while True:
+            call_start = time.perf_counter()
+            swapped = glossary.maybe_reload()
+            glossary.fix_transcript(drafts[i % len(drafts)])
+            longest = max(longest, time.perf_counter() - call_start)
+            i += 1
+            if swapped:
+                break
+        print(f"{'Reload (processing thread)':<28} {longest * 1000:>10.1f} ms max stall, "
+              f"swapped after {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Glossary throughput benchmark")
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--drafts", type=int, default=2000)
+    parser.add_argument("--naive-drafts", type=int, default=50, help="정규식 반복 방식은 느리므로 적은 수만 측정")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    entries = make_entries(args.entries, rng)
+    drafts = make_drafts(args.drafts, entries, rng)
+    patterns = sum(1 + len(aliases) for _, _, aliases in entries)
+    print(f"Glossary: {len(entries)} terms ({patterns} patterns), drafts: {len(drafts)} "
+          f"(avg {sum(len(d) for d in drafts) / len(drafts):.0f} chars)")
+
+    start = time.perf_counter()
+    state = Glossary._build(entries)
+    print(f"{'Build (EN + KO automaton)':<28} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+    en_matcher = state[0]
+
+    ac = bench("Aho-Corasick", en_matcher.replace, drafts)
+    bench_prompt_and_reload(entries, drafts)
+
+    # 비교용: 용어마다 정규식 1개 (용어 수에 비례)
+    replacements = {}
+    for term, _, aliases in entries:
+        for pattern in [term] + aliases:
+            replacements.setdefault(pattern, term)
+    regexes = [(re.compile(r"\b" + re.escape(p) + r"\b", re.IGNORECASE), r) for p, r in replacements.items()]
+
+    def naive(text):
+        for regex, replacement in regexes:
+            text = regex.sub(replacement, text)
+        return text
+
+    naive_drafts = drafts[:args.naive_drafts]
+    nv = bench("Regex per term (naive)", naive, naive_drafts)
+    print(f"Speedup: x{nv / ac:.0f}")
+
+    # 정확성 확인: 두 방식의 결과가 같은지
+    mismatches = sum(en_matcher.replace(t) != naive(t) for t in naive_drafts)
+    print(f"Mismatches vs naive: {mismatches}/{len(naive_drafts)}")
+
+    # 용어 수에 따른 비용 (문장당 한 번의 스캔 → 거의 일정해야 함)
+    for n in (100, 1000, args.entries):
+        subset = Matcher({p: r for p, r in list(replacements.items())[:n]})
+        bench(f"Aho-Corasick ({n} patterns)", subset.replace, drafts)
+
+
+if __name__ == "__main__":
+    main()
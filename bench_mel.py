@@ -0,0 +1,102 @@
+"""
+증분 log-mel 캐시 벤치마크 (프론트엔드 비용을 인코더 시간과 분리해서 측정)
+
+    python bench_mel.py [--seconds 12] [--wav meeting.wav] [--model Systran/faster-distil-whisper-small.en]
+
+0.5초 청크를 하나씩 붙여 가며, Draft 디코딩마다 드는 특징 추출 비용을
+(1) 버퍼 전체를 다시 계산하는 기존 방식, (2) mel_cache.IncrementalLogMel 로 비교합니다.
+--model 을 주면 같은 특징으로 인코더(model.encode)만 따로 시간을 잽니다.
+"""
+import os
+
+# 환경 설정 (OpenMP 충돌 방지)
+os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
+
+import argparse
+import time
+
+import numpy as np
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.feature_extractor import FeatureExtractor
+
+from mel_cache import IncrementalLogMel
+
+SAMPLE_RATE = 16000
+CHUNK_SIZE = int(SAMPLE_RATE * 0.5)
+
+
+def load_audio(path, seconds):
+    if path:
+        import scipy.io.wavfile
+        import scipy.signal
+        sr, data = scipy.io.wavfile.read(path)
+        if data.ndim == 2:
+            data = data[:, 0]
+        if np.issubdtype(data.dtype, np.integer):
+            data = data.astype(np.float32) / np.iinfo(data.dtype).max
+        if sr != SAMPLE_RATE:
+            data = scipy.signal.resample(data, int(len(data) * SAMPLE_RATE / sr))
+        return data[:int(seconds * SAMPLE_RATE)].astype(np.float32)
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    voice = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 6)) * (0.5 + 0.5 * np.sin(2 * np.pi * 4 * t))
+    return (0.1 * voice + 0.005 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental log-mel benchmark")
+    parser.add_argument("--seconds", type=float, default=12.0, help="버퍼 최대 길이 (live_translate.py의 문장 마감 기준)")
+    parser.add_argument("--wav")
+    parser.add_argument("--model", help="인코더 시간도 측정할 Faster-Whisper 모델")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    audio = load_audio(args.wav, args.seconds)
+    extractor = FeatureExtractor()
+    model = None
+    if args.model:
+        from faster_whisper import WhisperModel
+        model = WhisperModel(args.model, device="cpu", compute_type="int8")
+
+    full_ms, incremental_ms, encoder_ms = [], [], []
+    max_diff = 0.0
+    for _ in range(args.repeat):
+        cache = IncrementalLogMel(extractor)
+        for end in range(CHUNK_SIZE, len(audio) + 1, CHUNK_SIZE):
+            buffer = audio[:end]
+            scale = 1.0 / np.abs(buffer).max()
+
+            start = time.perf_counter()
+            reference = extractor(buffer * scale)
+            full_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            cache.append(audio[end - CHUNK_SIZE:end])
+            features = cache.features(scale)
+            incremental_ms.append((time.perf_counter() - start) * 1000)
+            max_diff = max(max_diff, float(np.abs(features - reference).max()))
+
+            if model is not None:
+                start = time.perf_counter()
+                model.encode(pad_or_trim(features))
+                encoder_ms.append((time.perf_counter() - start) * 1000)
+
+    steps = len(audio) // CHUNK_SIZE
+    last = slice(steps - 1, None, steps)  # 버퍼가 가장 길 때 (반복마다 마지막 단계)
+    print(f"Buffer 0.5s → {len(audio) / SAMPLE_RATE:.1f}s in 0.5s chunks, {args.repeat} runs")
+    print(f"{'':<26}{'mean / decode':>14}{'at full buffer':>16}")
+    print(f"{'Front-end (full buffer)':<26}{np.mean(full_ms):>11.2f} ms{np.mean(full_ms[last]):>13.2f} ms")
+    print(f"{'Front-end (incremental)':<26}{np.mean(incremental_ms):>11.2f} ms"
+          f"{np.mean(incremental_ms[last]):>13.2f} ms")
+    print(f"Front-end speedup: x{np.mean(full_ms) / np.mean(incremental_ms):.1f} "
+          f"(x{np.mean(full_ms[last]) / np.mean(incremental_ms[last]):.1f} at full buffer), "
+          f"max |diff| {max_diff:.2e}")
+    if encoder_ms:
+        print(f"{'Encoder (model.encode)':<26}{np.mean(encoder_ms):>11.2f} ms{np.mean(encoder_ms[last]):>13.2f} ms")
+        saved = np.mean(full_ms) - np.mean(incremental_ms)
+        print(f"Saved per decode: {saved:.2f} ms = {saved / (np.mean(encoder_ms) + np.mean(full_ms)) * 100:.1f}% "
+              f"of front-end + encoder")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+자막 검색 색인 벤치마크 (하루 분량 세션)
+
+    python bench_search.py [--lines 20000]
+
+문장을 하나씩 추가하는 비용과, 영어/한국어 질의의 지연(p50/p99)을 측정합니다.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from search_index import TranscriptIndex
+
+EN_WORDS = ("we need to review the budget for next quarter and the hiring plan before launch so "
+            "marketing can align on pricing while engineering ships the new search feature").split()
+KO_WORDS = ("우리는 다음 분기 예산을 검토하고 채용 계획을 출시 전에 확정해야 합니다 마케팅은 가격 정책을 "
+            "맞추고 개발팀은 새로운 검색 기능을 배포합니다").split()
+QUERIES = ["budget", "where did we talk about the budget", "hiring plan", "예산", "예", "예산을 검토", "검색 기능 배포",
+           "pricing 가격"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcript search index benchmark")
+    parser.add_argument("--lines", type=int, default=20000, help="확정 문장 수 (하루 회의 ≈ 수천~수만 줄)")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    index = TranscriptIndex()
+    start = time.perf_counter()
+    base = time.time()
+    for i in range(args.lines):
+        en = " ".join(rng.choices(EN_WORDS, k=rng.randint(8, 30)))
+        ko = " ".join(rng.choices(KO_WORDS, k=rng.randint(6, 20)))
+        index.add(i, en, ko, base + i * 4)
+    elapsed = time.perf_counter() - start
+    print(f"Indexed {args.lines} lines in {elapsed * 1000:.0f} ms ({elapsed / args.lines * 1e6:.1f} µs/line)")
+
+    for query in QUERIES:
+        latencies = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            hits = index.search(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(f"{query!r:<40} p50 {p50:6.2f} ms  p99 {p99:6.2f} ms  ({len(hits)} hits)")
+
+
+if __name__ == "__main__":
+    main()
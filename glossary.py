@@ -0,0 +1,266 @@
+"""
+사용자 용어집 (제품명, 약어 등 Whisper / 구글 번역이 자주 틀리는 용어 교정)
+
+glossary.txt 형식 (탭 구분, # 주석, 2~3번째 열은 생략 가능):
+
+    표준 표기<TAB>한국어 표기<TAB>오인식 별칭1|오인식 별칭2
+    Kubernetes	쿠버네티스	cooper netties|cube ernetes
+    LiveTalk		live talk|life talk
+
+- 인식 결과(영어): 별칭과 대소문자가 다른 표기를 표준 표기로 치환
+- 번역 결과(한국어): 번역문에 남아 있는 표준 표기/별칭을 한국어 표기로 치환
+- Whisper에는 최근에 등장한 용어부터 hotwords(또는 initial_prompt)로 전달
+
+용어 수와 관계없이 문장당 한 번의 스캔으로 끝나도록 Aho-Corasick 오토마톤으로 매칭합니다.
+실행 중 파일이 바뀌면 오토마톤은 백그라운드 스레드에서 새로 만들고, 완성된 뒤에 교체합니다 (디코딩 지연 없음).
+"""
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+PROMPT_MAX_CHARS = 600  # Whisper 프롬프트는 최대 224 토큰. 여유 있게 글자 수로 제한
+RECENT_TERMS = 200
+
+
+def _is_word_char(ch):
+    # 한국어 조사("쿠버네티스를")는 붙어도 되도록 ASCII 영숫자만 단어 경계로 취급
+    return ch.isascii() and ch.isalnum()
+
+
+def _lower(text):
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # 'İ' 처럼 소문자 변환 시 길이가 바뀌는 문자는 그대로 둠 (원문과 위치가 어긋나지 않도록)
+        lowered = "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+    return lowered
+
+
+class Matcher:
+    """대소문자 무시, 단어 경계 기준 leftmost-longest 다중 패턴 치환기 (Aho-Corasick)"""
+
+    def __init__(self, replacements):
+        # replacements: {패턴: 치환 문자열}
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [-1]       # 이 노드에서 끝나는 패턴 번호 (-1: 없음)
+        self.out_link = [0]   # fail 경로상 다음으로 패턴이 끝나는 노드 (0: 없음)
+        self.patterns = []    # (길이, 치환 문자열, 시작 경계 필요, 끝 경계 필요)
+
+        for pattern, replacement in replacements.items():
+            key = _lower(pattern.strip())
+            if not key:
+                continue
+            node = 0
+            for ch in key:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(-1)
+                    self.out_link.append(0)
+                node = nxt
+            if self.out[node] == -1:
+                self.out[node] = len(self.patterns)
+                self.patterns.append((len(key), replacement, _is_word_char(key[0]), _is_word_char(key[-1])))
+
+        # BFS로 fail / out_link 계산
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                f = self.goto[f].get(ch, 0)
+                self.fail[child] = f
+                self.out_link[child] = f if self.out[f] != -1 else self.out_link[f]
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def find(self, text):
+        """겹치지 않는 (시작, 끝, 패턴 번호) 목록 (leftmost-longest)"""
+        if not self.patterns:
+            return []
+        goto, fail, out, out_link, patterns = self.goto, self.fail, self.out, self.out_link, self.patterns
+        n = len(text)
+        candidates = []
+        node = 0
+        for i, ch in enumerate(_lower(text)):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = node if out[node] != -1 else out_link[node]
+            while hit:
+                pid = out[hit]
+                length, _, need_start, need_end = patterns[pid]
+                start = i - length + 1
+                if ((not need_start or start == 0 or not _is_word_char(text[start - 1]))
+                        and (not need_end or i + 1 == n or not _is_word_char(text[i + 1]))):
+                    candidates.append((start, -length, pid))
+                hit = out_link[hit]
+
+        matches = []
+        pos = 0
+        for start, neg_length, pid in sorted(candidates):
+            if start >= pos:
+                matches.append((start, start - neg_length, pid))
+                pos = start - neg_length
+        return matches
+
+    def replace(self, text, on_match=None):
+        matches = self.find(text)
+        if not matches:
+            return text
+        parts = []
+        pos = 0
+        for start, end, pid in matches:
+            parts.append(text[pos:start])
+            parts.append(self.patterns[pid][1])
+            if on_match is not None:
+                on_match(pid)
+            pos = end
+        parts.append(text[pos:])
+        return "".join(parts)
+
+
+class Glossary:
+    """glossary.txt를 읽어 인식/번역 결과를 교정. 파일이 바뀌면 maybe_reload()에서 다시 읽음"""
+
+    def __init__(self, path, reload_interval=1.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._mtime = None
+        self._next_check = 0.0
+        self._recent = OrderedDict()
+        self._state = self._build([])
+        self._pending = None  # 백그라운드에서 빌드를 마친 새 상태 (다음 maybe_reload()에서 교체)
+        self._loader = None
+        self.maybe_reload(background=False)
+
+    @staticmethod
+    def parse(lines):
+        """(표준 표기, 한국어 표기, [별칭...]) 목록"""
+        entries = []
+        for line in lines:
+            line = line.rstrip("\r\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            cols = line.split("\t")
+            term = cols[0].strip()
+            if not term:
+                continue
+            ko = cols[1].strip() if len(cols) > 1 else ""
+            aliases = [a.strip() for a in cols[2].split("|") if a.strip()] if len(cols) > 2 else []
+            entries.append((term, ko, aliases))
+        return entries
+
+    @staticmethod
+    def _build(entries):
+        en, ko = {}, {}
+        for term, ko_term, aliases in entries:
+            for pattern in [term] + aliases:
+                en.setdefault(pattern, term)
+                if ko_term:
+                    ko.setdefault(pattern, ko_term)
+        en_matcher = Matcher(en)
+        # 패턴 번호 -> 표준 표기 (최근 등장 용어 추적용)
+        en_terms = [replacement for _, replacement, _, _ in en_matcher.patterns]
+        prompt_terms = list(dict.fromkeys(term for term, _, _ in entries))
+        return en_matcher, Matcher(ko), en_terms, prompt_terms
+
+    def __len__(self):
+        return len(self._state[3])
+
+    def maybe_reload(self, background=True):
+        """파일 변경 시 다시 빌드. reload_interval 간격으로만 stat() 호출.
+        background=True 이면 빌드는 별도 스레드에서 하고, 완성된 상태는 다음 호출에서 교체 (교체되면 True)"""
+        pending = self._pending
+        if pending is not None:
+            # _state / _recent 는 호출한 스레드(처리 스레드)에서만 바꿈
+            self._pending = None
+            self._state = pending
+            self._recent.clear()
+            return True
+
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + self.reload_interval
+        if self._loader is not None and self._loader.is_alive():
+            return False
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+
+        if background:
+            self._loader = threading.Thread(target=self._load_in_background, args=(mtime,),
+                                            name="glossary-reload", daemon=True)
+            self._loader.start()
+            return False
+        state = self._load(mtime)
+        if state is None:
+            return False
+        self._state = state
+        self._recent.clear()
+        return True
+
+    def _load_in_background(self, mtime):
+        state = self._load(mtime)
+        if state is not None:
+            self._pending = state
+
+    def _load(self, mtime):
+        if mtime is None:
+            return self._build([])
+        start = time.perf_counter()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = self.parse(f)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"❌ 용어집 로드 실패: {e}")
+            return None
+        state = self._build(entries)
+        print(f"📚 Glossary loaded: {len(entries)} terms ({(time.perf_counter() - start) * 1000:.0f}ms)")
+        return state
+
+    def fix_transcript(self, text):
+        en_matcher, _, en_terms, _ = self._state
+
+        def remember(pid):
+            term = en_terms[pid]
+            self._recent[term] = None
+            self._recent.move_to_end(term)
+            if len(self._recent) > RECENT_TERMS:
+                self._recent.popitem(last=False)
+
+        return en_matcher.replace(text, remember)
+
+    def fix_translation(self, text):
+        return self._state[1].replace(text)
+
+    def prompt(self, max_chars=PROMPT_MAX_CHARS):
+        """Whisper hotwords / initial_prompt 용 용어 목록 (최근 등장 용어 우선). 용어집이 비었으면 None"""
+        prompt_terms = self._state[3]
+        if not prompt_terms:
+            return None
+        picked = {}
+        size = 0
+        # 목록을 복사하지 않고 앞에서부터 max_chars까지만 훑음 (용어집 크기와 무관)
+        for term in itertools.chain(reversed(self._recent), prompt_terms):
+            if term in picked:
+                continue
+            if size + len(term) + 2 > max_chars:
+                break
+            picked[term] = None
+            size += len(term) + 2
+        return ", ".join(picked)
@@ -0,0 +1,234 @@
+"""
+원격 오디오 수집 (캡처 PC → 추론 서버)
+
+캡처는 회의를 재생하는 윈도우 PC(WASAPI 루프백)에서, Faster-Whisper 추론은 다른 서버에서 돌리기 위한 모듈입니다.
+클라이언트는 하나의 chunked HTTP POST(/ingest)로 프레임을 계속 흘려보내고, 서버는 받은 프레임을 audio_queue에 넣습니다.
+
+프레임 형식 (little-endian):
+    magic  4B  b"LTK1"
+    codec  1B  0 = float32 PCM, 1 = int16 PCM
+    rate   4B  샘플레이트 (Hz)
+    time   8B  캡처 시각 (time.time(), 초)
+    size   4B  페이로드 바이트 수
+    payload     모노 PCM
+
+캡처 전용 클라이언트는 이 파일을 직접 실행합니다. (numpy + pyaudiowpatch만 필요, 모델/웹 서버 의존성 없음)
+
+    python ingest.py --server http://<서버>:5001 [--codec s16|f32]
+"""
+import argparse
+import json
+import queue
+import struct
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+# WASAPI Loopback 캡처는 윈도우 전용. 서버 쪽(live_translate.py, test_ingest.py)은 프레임 함수만 사용
+try:
+    import pyaudiowpatch as pyaudio
+except ImportError:
+    pyaudio = None
+
+MAGIC = b"LTK1"
+FRAME_HEADER = struct.Struct("<4sBIdI")
+CODEC_F32 = 0
+CODEC_S16 = 1
+CODECS = {"f32": CODEC_F32, "s16": CODEC_S16}
+SAMPLE_WIDTH = {CODEC_F32: 4, CODEC_S16: 2}
+MAX_FRAME_BYTES = 4 * 48000 * 10  # 48kHz float32 10초. 이보다 크면 잘못된 스트림으로 간주
+MIN_SAMPLE_RATE = 8000
+MAX_SAMPLE_RATE = 192000
+
+
+def pack_frame(audio, sample_rate, timestamp=None, codec=CODEC_S16):
+    audio = np.asarray(audio, dtype=np.float32)
+    if codec == CODEC_S16:
+        payload = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+    elif codec == CODEC_F32:
+        payload = audio.astype("<f4").tobytes()
+    else:
+        raise ValueError(f"지원하지 않는 codec: {codec}")
+    if timestamp is None:
+        timestamp = time.time()
+    return FRAME_HEADER.pack(MAGIC, codec, int(sample_rate), timestamp, len(payload)) + payload
+
+
+def _read_exact(stream, size):
+    data = b""
+    while len(data) < size:
+        part = stream.read(size - len(data))
+        if not part:
+            break
+        data += part
+    return data
+
+
+def read_frames(stream):
+    """스트림에서 (float32 오디오, 샘플레이트, 캡처 시각)을 차례로 생성. 형식이 틀리면 ValueError"""
+    while True:
+        header = _read_exact(stream, FRAME_HEADER.size)
+        if not header:
+            return
+        if len(header) < FRAME_HEADER.size:
+            raise ValueError("프레임 헤더가 잘렸습니다.")
+        magic, codec, sample_rate, timestamp, size = FRAME_HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"잘못된 프레임 magic: {magic!r}")
+        # 네트워크에서 들어온 값이므로 audio_queue에 넣기 전에 검증 (샘플레이트 0이나 빈 프레임은 처리 스레드를 죽임)
+        if codec not in SAMPLE_WIDTH:
+            raise ValueError(f"지원하지 않는 codec: {codec}")
+        if not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+            raise ValueError(f"잘못된 샘플레이트: {sample_rate}Hz")
+        if size == 0 or size % SAMPLE_WIDTH[codec]:
+            raise ValueError(f"잘못된 페이로드 길이: {size} bytes")
+        if size > MAX_FRAME_BYTES:
+            raise ValueError(f"프레임이 너무 큽니다: {size} bytes")
+        payload = _read_exact(stream, size)
+        if len(payload) < size:
+            raise ValueError("프레임 페이로드가 잘렸습니다.")
+
+        if codec == CODEC_S16:
+            audio = np.frombuffer(payload, dtype="<i2").astype(np.float32) / 32767
+        else:
+            audio = np.frombuffer(payload, dtype="<f4").astype(np.float32)
+        yield audio, sample_rate, timestamp
+
+
+def stream_audio(url, frames):
+    """frames(이미 pack_frame 된 bytes)를 하나의 chunked POST로 전송하고 서버 응답(bytes)을 반환"""
+    req = urllib.request.Request(url, data=frames, method="POST",
+                                 headers={"Content-Type": "application/octet-stream"})
+    with urllib.request.urlopen(req) as resp:
+        return resp.read()
+
+
+def check_server(url):
+    """스트림을 열기 전 GET /ingest 로 서버가 받을 수 있는 상태인지 확인. 거부되면 urllib.error.HTTPError"""
+    with urllib.request.urlopen(url) as resp:
+        return resp.read()
+
+
+def error_text(error):
+    """HTTPError 응답 본문의 {"error": ...} 메시지 (JSON이 아니면 본문 그대로)"""
+    body = error.read().decode("utf-8", "replace")
+    try:
+        return json.loads(body).get("error") or body
+    except (ValueError, AttributeError):
+        return body or str(error)
+
+
+def wav_frames(path, chunk_seconds=0.5, codec=CODEC_S16, realtime=False):
+    """WAV 파일을 record_audio_loop와 같은 0.5초 모노 프레임으로 나눠 생성"""
+    import scipy.io.wavfile
+    sample_rate, data = scipy.io.wavfile.read(path)
+    if data.ndim == 2:
+        data = data[:, 0]
+    if np.issubdtype(data.dtype, np.integer):
+        data = data.astype(np.float32) / np.iinfo(data.dtype).max
+    chunk = int(sample_rate * chunk_seconds)
+    start = time.time()
+    for i in range(0, len(data), chunk):
+        timestamp = start + i / sample_rate
+        if realtime:
+            time.sleep(max(0.0, timestamp + chunk_seconds - time.time()))
+        yield pack_frame(data[i:i + chunk], sample_rate, timestamp, codec)
+
+
+def capture_client(url, source_queue, codec=CODEC_S16, reconnect_delay=2.0):
+    """캡처 전용 모드: source_queue의 (오디오, 샘플레이트, 캡처 시각)을 서버 /ingest 로 계속 전송. 끊기면 재연결"""
+
+    def frames():
+        while True:
+            # 전송 시각이 아닌 캡처 시각을 실어 보내야 서버에서 누락/지연을 올바르게 계산할 수 있음
+            audio_array, sample_rate, timestamp = source_queue.get()
+            yield pack_frame(audio_array, sample_rate, timestamp, codec)
+
+    while True:
+        print(f"📡 Streaming audio to {url}")
+        try:
+            check_server(url)
+            stream_audio(url, frames())
+        except urllib.error.HTTPError as e:
+            print(f"❌ 서버가 거부했습니다 ({e.code}): {error_text(e)} ({reconnect_delay:.0f}초 후 재시도)")
+        except Exception as e:
+            print(f"❌ 전송 오류: {e} ({reconnect_delay:.0f}초 후 재연결)")
+        time.sleep(reconnect_delay)
+        # 끊겨 있는 동안 쌓인 오래된 오디오는 버림 (실시간 자막이므로 지연보다 누락이 나음)
+        try:
+            while True:
+                source_queue.get_nowait()
+        except queue.Empty:
+            pass
+
+
+def get_default_wasapi_device(p):
+    """pyaudiowpatch 윈도우 루프백 장치 탐색"""
+    try:
+        wasapi_info = p.get_host_api_info_by_type(pyaudio.paWASAPI)
+        default_speakers = p.get_device_info_by_index(wasapi_info["defaultOutputDevice"])
+
+        if not default_speakers["isLoopbackDevice"]:
+            for loopback in p.get_loopback_device_info_generator():
+                if default_speakers["name"] in loopback["name"]:
+                    print(f"🎤 Loopback found: {loopback['name']}")
+                    return loopback
+
+        return default_speakers
+    except Exception as e:
+        print(f"❌ 장치 검색 오류: {e}")
+        return None
+
+
+def record_audio_loop(out_queue):
+    """시스템 오디오를 live_translate.py와 같은 0.5초 모노 청크로 캡처해 (오디오, 샘플레이트, 캡처 시작 시각)을 out_queue에 넣음"""
+    p = pyaudio.PyAudio()
+    device = get_default_wasapi_device(p)
+    if device is None:
+        return
+
+    try:
+        device_channels = device["maxInputChannels"]
+        actual_mic_sr = int(device["defaultSampleRate"])
+
+        stream = p.open(format=pyaudio.paFloat32,
+                        channels=device_channels,
+                        rate=actual_mic_sr,
+                        input=True,
+                        input_device_index=device["index"],
+                        frames_per_buffer=int(actual_mic_sr * 0.5))
+
+        while True:
+            data = stream.read(int(actual_mic_sr * 0.5), exception_on_overflow=False)
+            # read()는 0.5초 분량이 모두 쌓인 뒤 반환되므로 캡처 시작 시각은 0.5초 전
+            timestamp = time.time() - 0.5
+            audio_array = np.frombuffer(data, dtype=np.float32)
+            if device_channels > 1:
+                audio_array = np.reshape(audio_array, (-1, device_channels))
+                audio_array = audio_array[:, 0]
+            out_queue.put((audio_array, actual_mic_sr, timestamp))
+    except Exception as e:
+        print(f"녹음 오류: {e}")
+    finally:
+        p.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LiveTalk-KoEn 캡처 전용 클라이언트 (시스템 오디오 → 추론 서버 /ingest)")
+    parser.add_argument("--server", default="http://127.0.0.1:5001", metavar="URL",
+                        help="오디오를 보낼 추론 서버 주소 (서버는 live_translate.py --no-capture 로 실행)")
+    parser.add_argument("--codec", choices=sorted(CODECS), default="s16",
+                        help="전송 형식 (s16: 대역폭 절반, f32: 무손실)")
+    args = parser.parse_args()
+    if pyaudio is None:
+        raise SystemExit("❌ pyaudiowpatch가 없어 시스템 오디오를 캡처할 수 없습니다. (pip install pyaudiowpatch)")
+
+    captured = queue.Queue()
+    threading.Thread(target=record_audio_loop, args=(captured,), name="capture", daemon=True).start()
+    try:
+        capture_client(args.server.rstrip("/") + "/ingest", captured, CODECS[args.codec])
+    except KeyboardInterrupt:
+        print("\n🛑 프로그램 종료.")
@@ -1,17 +1,32 @@
+import argparse
+import inspect
 import os
 import threading
 import queue
+import socket
 import time
 import traceback
 import warnings
+from collections import deque
 
 # 환경 설정 (OpenMP 충돌 방지)
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
 
 import numpy as np
-import pyaudiowpatch as pyaudio
 from faster_whisper import WhisperModel
-from flask import Flask, jsonify, render_template_string
+from flask import Flask, Response, jsonify, render_template_string, request
+
+import ingest
+import mel_cache
+import profiler
+from glossary import Glossary
+from search_index import TranscriptIndex
+
+# WASAPI Loopback 캡처는 윈도우 전용. 다른 OS에서는 캡처 없이 처리/웹 서버만 동작 (soak.py 등)
+try:
+    import pyaudiowpatch as pyaudio
+except ImportError:
+    pyaudio = None
 
 # Python 3.13에서 cgi 모듈이 삭제되어 googletrans 호환성 문제가 발생하므로 임시 Mock 적용
 import sys
@@ -30,11 +45,17 @@ MODEL_SIZE = "Systran/faster-distil-whisper-small.en"
 SAMPLE_RATE = 16000
 CHUNK_SIZE = int(SAMPLE_RATE * 0.5)  # 0.5초 단위 청크
 VOLUME_THRESHOLD = 0.0001
+GLOSSARY_PATH = "glossary.txt"  # 사용자 용어집 (없으면 미사용, 실행 중 수정하면 자동 재로딩)
 # ==========================================
 
-audio_queue = queue.Queue()
+audio_queue = queue.Queue()  # (오디오, 샘플레이트, 캡처 시작 시각)
 transcribed_logs = []  # 완료된 번역 로그 (Final)
 current_draft = {"en": "", "ko": ""}  # 현재 실시간 작성중인 문장 (Draft)
+glossary = Glossary(GLOSSARY_PATH)
+transcript_index = TranscriptIndex()  # 확정된 문장 검색용 (문장 번호 = transcribed_logs 인덱스)
+local_capture_active = False  # 이 PC에서 WASAPI 캡처 중이면 True (/ingest 거부)
+ingest_lock = threading.Lock()  # /ingest 원격 스트림은 동시에 하나만 허용
+model_ready = threading.Event()  # 모델 로딩이 끝나면 set (--profile 대기 시간 기준)
 
 app = Flask(__name__)
 
@@ -100,10 +121,20 @@ HTML_TEMPLATE = """
         button:hover { opacity: 0.8; }
         .btn-copy { background-color: #3700b3; }
         .btn-clear { background-color: #cf6679; color: #000; }
+        
+        /* 자막 검색 */
+        #search-box { width: 100%; box-sizing: border-box; padding: 12px 16px; margin-bottom: 10px; background-color: #1e1e1e; color: #e0e0e0; border: 1px solid #333; border-radius: 8px; font-size: 16px; }
+        #search-results { max-height: 25vh; overflow-y: auto; margin-bottom: 10px; }
+        .search-hit { padding: 8px 12px; border-bottom: 1px solid #333; cursor: pointer; font-size: 15px; }
+        .search-hit:hover { background-color: #2a2a2a; }
+        .search-time { color: #03dac6; margin-right: 10px; }
+        .log-entry.highlight { background-color: #3a3a1e; }
     </style>
 </head>
 <body>
     <div class="container">
+        <input id="search-box" type="search" placeholder="🔍 자막 검색 (영어 / 한국어)" oninput="onSearchInput()">
+        <div id="search-results"></div>
         <div id="chat-box">Waiting for audio to translate...</div>
         <div class="btn-group">
             <button class="btn-copy" onclick="copyAll()">📋 전체 복사</button>
@@ -114,6 +145,8 @@ HTML_TEMPLATE = """
         setInterval(fetchLogs, 500); // 0.5초마다 빠르게 갱신 (실시간 체감 극대화)
         
         let lastDraftEn = '';
+        let highlightedId = null;
+        let searchTimer = null;
         
         function fetchLogs() {
             fetch('/update')
@@ -127,8 +160,8 @@ HTML_TEMPLATE = """
                         return;
                     }
                     
-                    const newHtml = data.logs.map(log => `
-                        <div class="log-entry ${log.is_draft ? 'draft-entry' : ''}">
+                    const newHtml = data.logs.map((log, i) => `
+                        <div class="log-entry ${log.is_draft ? 'draft-entry' : ''} ${i === highlightedId ? 'highlight' : ''}" id="log-${i}">
                             <div class="en-text">🇺🇸 ${log.en}</div>
                             <div class="ko-text">🇰🇷 ${log.ko}</div>
                         </div>
@@ -143,6 +176,39 @@ HTML_TEMPLATE = """
                     }
                 });
         }
+        function onSearchInput() {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(runSearch, 200);
+        }
+        function runSearch() {
+            const q = document.getElementById('search-box').value.trim();
+            const results = document.getElementById('search-results');
+            if (!q) {
+                results.innerHTML = '';
+                return;
+            }
+            fetch('/search?q=' + encodeURIComponent(q))
+                .then(response => response.json())
+                .then(data => {
+                    if (data.hits.length === 0) {
+                        results.innerHTML = '<div class="search-hit">검색 결과가 없습니다.</div>';
+                        return;
+                    }
+                    results.innerHTML = data.hits.map(hit => `
+                        <div class="search-hit" onclick="jumpTo(${hit.id})">
+                            <span class="search-time">${new Date(hit.ts * 1000).toLocaleTimeString()}</span>${hit.en} / ${hit.ko}
+                        </div>
+                    `).join('');
+                });
+        }
+        function jumpTo(id) {
+            const entry = document.getElementById('log-' + id);
+            if (!entry) return;
+            highlightedId = id;
+            entry.classList.add('highlight');
+            entry.scrollIntoView({ block: 'center' });
+            setTimeout(() => { highlightedId = null; }, 3000);
+        }
         function copyAll() {
             // draft 문구, 아이콘 빼고 텍스트 부분만 깔끔하게 복사하면 더 좋지만 지금은 전체 복사 유지
             const text = document.getElementById('chat-box').innerText;
@@ -177,9 +243,92 @@ def clear_logs():
     global transcribed_logs, current_draft
     transcribed_logs = []
     current_draft = {"en": "", "ko": ""}
+    transcript_index.clear()
     print("🧹 화면과 메모리가 초기화되었습니다.")
     return jsonify({'status': 'cleared'})
 
+@app.route('/search')
+def search():
+    # 예: /search?q=budget&limit=20 → 점수순 검색 결과 (ts: 문장이 확정된 시각)
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', 20, type=int)
+    start = time.perf_counter()
+    hits = transcript_index.search(query, limit=max(1, min(limit, 200)))
+    return jsonify({'query': query, 'hits': hits, 'took_ms': round((time.perf_counter() - start) * 1000, 2)})
+
+def _ingest_rejection():
+    # 여러 음원이 같은 audio_queue에 섞이면 한 문장 버퍼에 뒤섞여 인식이 망가지므로 하나만 허용
+    if local_capture_active:
+        return '이 서버는 로컬 오디오를 캡처 중입니다. --no-capture 로 실행하세요.'
+    if ingest_lock.locked():
+        return '이미 다른 원격 캡처 스트림이 연결되어 있습니다.'
+    return None
+
+@app.route('/ingest', methods=['GET', 'POST'])
+def ingest_audio():
+    # 원격 캡처 클라이언트(python ingest.py --server ...)가 보내는 오디오 프레임을 받아 audio_queue에 넣음
+    # GET: 스트림을 열기 전 확인용 (클라이언트는 끝없는 POST 본문을 다 보낸 뒤에야 응답을 읽으므로, 거부 사유는 여기서 전달)
+    error = _ingest_rejection()
+    if request.method == 'GET':
+        if error:
+            return jsonify({'error': error}), 409
+        return jsonify({'status': 'ready'})
+    if error is None and not ingest_lock.acquire(blocking=False):
+        error = '이미 다른 원격 캡처 스트림이 연결되어 있습니다.'
+    if error:
+        _close_ingest_input()
+        return jsonify({'error': error}), 409
+    try:
+        return _receive_ingest_stream()
+    finally:
+        ingest_lock.release()
+
+def _close_ingest_input():
+    # werkzeug는 응답 후 남은 본문을 계속 읽어 버리므로, 끝없는 스트림이면 클라이언트가 거부를 알 수 없음.
+    # 수신 쪽을 닫아 연결을 끊고, 클라이언트가 전송 오류로 재연결(→ GET 확인에서 거부 사유 출력)하게 함
+    sock = request.environ.get('werkzeug.socket')
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RD)
+        except OSError:
+            pass
+
+def _receive_ingest_stream():
+    print(f"📡 Remote capture connected: {request.remote_addr}")
+    frames = 0
+    lags = deque(maxlen=120)  # 최근 1분(0.5초 프레임 120개)만 유지 (장시간 연결에서도 메모리 고정)
+    last_end = None
+    try:
+        for audio_array, sample_rate, timestamp in ingest.read_frames(request.stream):
+            audio_queue.put((audio_array, sample_rate, timestamp))
+            frames += 1
+            lags.append(time.time() - timestamp)
+            # 캡처 시각이 이전 프레임 끝보다 크게 벌어지면 클라이언트 쪽에서 오디오가 빠진 것
+            if last_end is not None and timestamp - last_end > 0.25:
+                print(f"⚠️ 원격 오디오 {timestamp - last_end:.1f}초 누락")
+            last_end = timestamp + len(audio_array) / sample_rate
+    except ValueError as e:
+        print(f"❌ 잘못된 오디오 스트림: {e}")
+        return jsonify({'error': str(e), 'frames': frames}), 400
+    lag = float(np.median(lags)) if lags else None
+    print(f"📡 Remote capture disconnected: {frames} frames" + (f", recent median lag {lag * 1000:.0f}ms" if lag is not None else ""))
+    return jsonify({'status': 'ok', 'frames': frames, 'median_lag': lag})
+
+@app.route('/debug/profile')
+def debug_profile():
+    # 예: /debug/profile?seconds=10&format=collapsed (샘플링) | format=pstats (cProfile), threads=all 이면 Flask 스레드 포함
+    seconds = request.args.get('seconds', 10, type=float)
+    fmt = request.args.get('format', 'collapsed')
+    threads = request.args.get('threads', ','.join(profiler.DEFAULT_THREADS))
+    thread_names = None if threads == 'all' else tuple(threads.split(','))
+    try:
+        text, _ = profiler.profile(seconds, fmt, thread_names)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 409
+    return Response(text, mimetype='text/plain')
+
 # ==========================================
 # 백엔드 로직
 # ==========================================
@@ -201,6 +350,10 @@ def get_default_wasapi_device(p):
         return None
 
 def record_audio_loop():
+    global local_capture_active
+    if pyaudio is None:
+        print("❌ pyaudiowpatch가 없어 시스템 오디오를 캡처할 수 없습니다.")
+        return
     p = pyaudio.PyAudio()
     device = get_default_wasapi_device(p)
     if device is None: return
@@ -215,23 +368,30 @@ def record_audio_loop():
                         input=True,
                         input_device_index=device["index"],
                         frames_per_buffer=int(actual_mic_sr * 0.5))
+        local_capture_active = True
                         
         while True:
+            profiler.checkpoint()
             data = stream.read(int(actual_mic_sr * 0.5), exception_on_overflow=False)
+            # read()는 0.5초 분량이 모두 쌓인 뒤 반환되므로 캡처 시작 시각은 0.5초 전
+            timestamp = time.time() - 0.5
             audio_array = np.frombuffer(data, dtype=np.float32)
             if device_channels > 1:
                 audio_array = np.reshape(audio_array, (-1, device_channels))
                 audio_array = audio_array[:, 0]
-            audio_queue.put((audio_array, actual_mic_sr))
+            audio_queue.put((audio_array, actual_mic_sr, timestamp))
     except Exception as e:
         print(f"녹음 오류: {e}")
     finally:
+        local_capture_active = False
         p.terminate()
 
-def process_audio_loop():
+def process_audio_loop(model=None):
     global current_draft, transcribed_logs
-    print("Loading Faster-Whisper model...")
-    model = WhisperModel(MODEL_SIZE, device="cpu", compute_type="int8")
+    if model is None:
+        print("Loading Faster-Whisper model...")
+        model = WhisperModel(MODEL_SIZE, device="cpu", compute_type="int8")
+    model_ready.set()
     print(f"✅ Web Server Running on http://127.0.0.1:5001")
     
     import scipy.signal
@@ -239,9 +399,14 @@ def process_audio_loop():
     silence_counter = 0
     last_translated_en = ""
     last_translated_ko = ""
+    # 용어집 용어를 Whisper에 힌트로 전달 (hotwords 미지원 버전은 initial_prompt 사용)
+    prompt_arg = "hotwords" if "hotwords" in inspect.signature(model.transcribe).parameters else "initial_prompt"
+    # 새로 들어온 청크의 mel 프레임만 계산해 두고 디코딩 때 재사용 (지원하지 않는 모델이면 None)
+    mel_features = mel_cache.install(model)
     
     while True:
-        audio_data, mic_samplerate = audio_queue.get()
+        profiler.checkpoint()
+        audio_data, mic_samplerate, _ = audio_queue.get()
         
         # 1. 16kHz 다운샘플링
         if mic_samplerate != SAMPLE_RATE:
@@ -260,6 +425,8 @@ def process_audio_loop():
         # 누적
         if len(accumulated_audio) > 0 or vol >= VOLUME_THRESHOLD:
              accumulated_audio = np.concatenate((accumulated_audio, chunk_16k))
+             if mel_features is not None:
+                 mel_features.append(chunk_16k)
         
         # 음성이 존재할 때만 분석 실행. 너무 짧은(0.5초 미만) 길이는 오인식 방지를 위해 스킵
         if len(accumulated_audio) >= SAMPLE_RATE * 0.5:
@@ -267,19 +434,23 @@ def process_audio_loop():
                 audio_array = accumulated_audio.copy()
                 max_val = np.abs(audio_array).max()
                 if max_val > 0: audio_array = audio_array / max_val
+                if mel_features is not None:
+                    mel_features.arm(len(audio_array), 1.0 / max_val if max_val > 0 else 1.0)
                     
                 # Draft 번역 (실시간)
-                segments, _ = model.transcribe(audio_array, beam_size=2, language="en", vad_filter=False, condition_on_previous_text=False)
+                glossary.maybe_reload()
+                segments, _ = model.transcribe(audio_array, beam_size=2, language="en", vad_filter=False, condition_on_previous_text=False,
+                                               **{prompt_arg: glossary.prompt()})
                 full_text = [seg.text.strip() for seg in segments if len(seg.text.strip()) > 1]
                 
                 if full_text:
-                    en_text = ' '.join(full_text)
+                    en_text = glossary.fix_transcript(' '.join(full_text))
                     
                     # 새롭게 단어가 추가되었을 때만 번역 API 호출 (API 제한/지연 방지)
                     if en_text != last_translated_en:
                         try:
                             # 번역기 품질 개선: 전체 문맥을 통째로 넣음
-                            ko_trans = translator.translate(en_text, dest='ko').text
+                            ko_trans = glossary.fix_translation(translator.translate(en_text, dest='ko').text)
                         except Exception as e:
                             ko_trans = f"[번역 중...]"
                         
@@ -293,22 +464,47 @@ def process_audio_loop():
         # 1초 이상 무음(silence_counter >= 2)이거나 버퍼가 너무 길어진 경우 (최대 12초), 문장을 마감(Commit)
         if (silence_counter >= 2 and len(accumulated_audio) > 0) or len(accumulated_audio) > SAMPLE_RATE * 12:
             if current_draft['en']:
-                transcribed_logs.append({"en": current_draft['en'], "ko": current_draft['ko'], "is_draft": False})
+                entry = {"en": current_draft['en'], "ko": current_draft['ko'], "is_draft": False, "ts": time.time()}
+                transcribed_logs.append(entry)
+                transcript_index.add(len(transcribed_logs) - 1, entry['en'], entry['ko'], entry['ts'])
                 print(f"✅ [저장됨] {current_draft['en']} -> {current_draft['ko']}")
             
             # 버퍼 및 초기화
             accumulated_audio = np.array([], dtype=np.float32)
+            if mel_features is not None:
+                mel_features.reset()
             current_draft = {"en": "", "ko": ""}
             last_translated_en = ""
             last_translated_ko = ""
             silence_counter = 0
 
 if __name__ == "__main__":
-    t1 = threading.Thread(target=record_audio_loop, daemon=True)
-    t1.start()
+    parser = argparse.ArgumentParser(description="LiveTalk-KoEn 실시간 영→한 번역")
+    parser.add_argument("--profile", type=float, metavar="SECONDS",
+                        help="캡처/처리 스레드를 SECONDS 동안 샘플링 + cProfile로 측정해 profile_*.collapsed.txt / .pstats로 저장")
+    parser.add_argument("--profile-delay", type=float, default=30.0, metavar="SECONDS",
+                        help="모델 로딩이 끝난 뒤 --profile 측정을 시작하기까지의 대기 시간")
+    parser.add_argument("--glossary", default=GLOSSARY_PATH, metavar="PATH",
+                        help="용어집 파일 (표준 표기<TAB>한국어 표기<TAB>별칭1|별칭2)")
+    parser.add_argument("--no-capture", action="store_true",
+                        help="이 PC에서는 캡처하지 않고 /ingest 로 들어오는 원격 오디오만 처리 (캡처 PC에서는 python ingest.py --server URL)")
+    args = parser.parse_args()
+    if args.glossary != GLOSSARY_PATH:
+        glossary = Glossary(args.glossary)
+
+    if not args.no_capture:
+        t1 = threading.Thread(target=record_audio_loop, name="capture", daemon=True)
+        t1.start()
     
-    t2 = threading.Thread(target=process_audio_loop, daemon=True)
+    t2 = threading.Thread(target=process_audio_loop, name="processing", daemon=True)
     t2.start()
+
+    if args.profile:
+        def delayed_profile():
+            model_ready.wait()
+            time.sleep(args.profile_delay)
+            profiler.profile_to_files(args.profile)
+        threading.Thread(target=delayed_profile, daemon=True).start()
     
     # 새 포트는 5001 사용 (기존 web.py 충돌 방지)
     app.run(host='0.0.0.0', port=5001, debug=False, use_reloader=False)
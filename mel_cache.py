@@ -0,0 +1,162 @@
+"""
+누적 오디오 버퍼용 증분 log-mel 특징 캐시
+
+process_audio_loop는 0.5초마다 accumulated_audio 전체를 model.transcribe()에 넘기므로,
+Faster-Whisper가 매번 버퍼 전체의 STFT/mel을 다시 계산합니다 (O(버퍼)).
+여기서는 새로 들어온 오디오에 대해서만 STFT 프레임을 계산해 mel 파워를 쌓아 두고,
+디코딩 시에는 끝부분(다음 오디오에 따라 달라지는 프레임)만 다시 계산해 특징을 조립합니다 (O(청크)).
+
+faster-whisper FeatureExtractor(>= 1.0)의 계산을 그대로 따릅니다:
+끝에 padding(160) 개의 0을 붙이고, 양쪽을 n_fft // 2 만큼 reflect 패딩한 STFT의 마지막 프레임을 버린 뒤
+log10 → (최댓값 - 8) 클램프 → (x + 4) / 4.
+정규화(audio / max_val)는 mel 파워에 scale^2 를 곱하는 것과 같으므로 캐시는 원본 오디오 기준으로 유지합니다.
+처음 사용할 때 원래 추출기 결과와 비교해 다르면 캐시를 끄고 원래 경로로 되돌립니다.
+"""
+import inspect
+import time
+
+import numpy as np
+
+
+class IncrementalLogMel:
+    """오디오 버퍼와 정렬된 mel 파워 프레임 캐시"""
+
+    def __init__(self, feature_extractor):
+        self.n_fft = feature_extractor.n_fft
+        self.hop = feature_extractor.hop_length
+        self.mel_filters = feature_extractor.mel_filters.astype(np.float32)
+        self.window = np.hanning(self.n_fft + 1)[:-1].astype(np.float32)
+        padding = inspect.signature(feature_extractor.__call__).parameters.get("padding")
+        # 구버전(padding=True → 30초 0 패딩)은 계산 방식이 달라 지원하지 않음
+        self.padding = padding.default if padding is not None and type(padding.default) is int else None
+
+        self.frontend_seconds = 0.0  # append + 특징 조립에 쓴 누적 시간 (인코더 시간과 별도 측정용)
+        self.reset()
+
+    @property
+    def supported(self):
+        return self.padding is not None
+
+    def reset(self):
+        self.num_samples = 0
+        self._pending = np.array([], dtype=np.float32)  # 왼쪽 reflect 패딩을 만들기 전까지 모아 두는 오디오
+        self._stream = None   # reflect 패딩된 스트림 중 아직 확정되지 않은 프레임부터의 구간
+        self._mel = np.empty((self.mel_filters.shape[0], 0), dtype=np.float32)
+        self._n_stable = 0    # 이후 오디오와 무관하게 확정된 프레임 수
+        self._armed = None
+
+    def _power_frames(self, samples, n_frames):
+        assert (n_frames - 1) * self.hop + self.n_fft <= len(samples)
+        frames = np.lib.stride_tricks.as_strided(
+            samples, (n_frames, self.n_fft), (self.hop * samples.strides[0], samples.strides[0]))
+        spectrum = np.fft.rfft(frames * self.window, n=self.n_fft, axis=-1).astype(np.complex64)
+        return self.mel_filters @ (np.abs(spectrum) ** 2).T
+
+    def append(self, chunk):
+        """accumulated_audio에 붙인 것과 같은 청크를 전달"""
+        start = time.perf_counter()
+        chunk = np.asarray(chunk, dtype=np.float32)
+        self.num_samples += len(chunk)
+        half = self.n_fft // 2
+
+        if self._stream is None:
+            self._pending = np.concatenate((self._pending, chunk))
+            if len(self._pending) <= half:
+                self.frontend_seconds += time.perf_counter() - start
+                return
+            # np.pad(mode="reflect")와 같은 왼쪽 패딩
+            self._stream = np.concatenate((self._pending[half:0:-1], self._pending))
+            self._pending = None
+        else:
+            self._stream = np.concatenate((self._stream, chunk))
+
+        # 프레임 t는 스트림 [t*hop, t*hop + n_fft) 구간. 스트림 안에 완전히 들어오면 확정
+        n_new = 0 if len(self._stream) < self.n_fft else (len(self._stream) - self.n_fft) // self.hop + 1
+        if n_new > 0:
+            self._store(self._power_frames(self._stream, n_new))
+            self._stream = self._stream[n_new * self.hop:].copy()
+            self._n_stable += n_new
+        self.frontend_seconds += time.perf_counter() - start
+
+    def _store(self, mel):
+        # 용량을 두 배씩 늘려 청크마다 전체 복사가 일어나지 않도록 함
+        used = self._n_stable
+        needed = used + mel.shape[1]
+        if needed > self._mel.shape[1]:
+            grown = np.empty((self._mel.shape[0], max(needed, 2 * self._mel.shape[1], 256)), dtype=np.float32)
+            grown[:, :used] = self._mel[:, :used]
+            self._mel = grown
+        self._mel[:, used:needed] = mel
+
+    def arm(self, num_samples, scale=1.0):
+        """다음 feature_extractor 호출(길이 num_samples, audio * scale)에 캐시를 사용하도록 예약"""
+        self._armed = (num_samples, scale)
+
+    def take_armed(self, num_samples, padding):
+        armed, self._armed = self._armed, None
+        if armed is None or armed[0] != num_samples or num_samples != self.num_samples:
+            return None
+        if padding != self.padding or self._stream is None:
+            return None
+        return armed[1]
+
+    def features(self, scale=1.0):
+        """FeatureExtractor(audio * scale) 와 같은 log-mel 특징"""
+        start = time.perf_counter()
+        total = (self.num_samples + self.padding) // self.hop
+        # 끝부분: 확정되지 않은 스트림 + 0 패딩 + 오른쪽 reflect 패딩
+        tail = np.concatenate((self._stream, np.zeros(self.padding, dtype=np.float32)))
+        tail = np.pad(tail, (0, self.n_fft // 2), mode="reflect")
+        mel = np.concatenate((self._mel[:, :self._n_stable],
+                              self._power_frames(tail, total - self._n_stable)), axis=1)
+
+        log_spec = np.log10(np.clip(mel * np.float32(scale * scale), a_min=1e-10, a_max=None))
+        log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+        log_spec = (log_spec + 4.0) / 4.0
+        self.frontend_seconds += time.perf_counter() - start
+        return log_spec
+
+
+class CachedFeatureExtractor:
+    """model.feature_extractor를 감싸서, 예약된 호출에는 IncrementalLogMel 결과를 돌려줌"""
+
+    def __init__(self, wrapped, cache, tolerance=1e-3):
+        self._wrapped = wrapped
+        self._cache = cache
+        self._verified = False
+        self._tolerance = tolerance
+
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+
+    def __call__(self, waveform, padding=160, chunk_length=None, **kwargs):
+        scale = self._cache.take_armed(len(waveform), padding) if self._cache.supported else None
+        if scale is None or kwargs:
+            return self._wrapped(waveform, padding=padding, chunk_length=chunk_length, **kwargs)
+
+        if chunk_length is not None:
+            # 원래 추출기와 같은 부수 효과 유지
+            self._wrapped.n_samples = chunk_length * self._wrapped.sampling_rate
+            self._wrapped.nb_max_frames = self._wrapped.n_samples // self._wrapped.hop_length
+        features = self._cache.features(scale)
+
+        if not self._verified:
+            reference = self._wrapped(waveform, padding=padding, chunk_length=chunk_length)
+            if reference.shape != features.shape or not np.allclose(reference, features, atol=self._tolerance):
+                print("⚠️ 증분 mel 캐시 결과가 원래 추출기와 달라 캐시를 끕니다.")
+                self._cache.padding = None
+                return reference
+            self._verified = True
+        return features
+
+
+def install(model):
+    """model.feature_extractor를 캐시 버전으로 교체하고 IncrementalLogMel 반환 (지원하지 않으면 None)"""
+    extractor = getattr(model, "feature_extractor", None)
+    if extractor is None or not hasattr(extractor, "mel_filters"):
+        return None
+    cache = IncrementalLogMel(extractor)
+    if not cache.supported:
+        return None
+    model.feature_extractor = CachedFeatureExtractor(extractor, cache)
+    return cache
@@ -0,0 +1,185 @@
+"""
+실행 중인 세션을 재시작 없이 프로파일링하는 도구 (/debug/profile, --profile)
+
+- 샘플링: sys._current_frames()로 대상 스레드의 스택을 주기적으로 수집해 collapsed stack 텍스트로 반환
+  (flamegraph.pl / speedscope 에 바로 입력 가능)
+- cProfile: 캡처/처리 스레드 루프가 매 반복마다 checkpoint()를 호출하고, 프로파일 요청이 있을 때만
+  해당 스레드 안에서 cProfile을 켜고 끔. 요청이 없을 때 비용은 빈 튜플 확인 1회뿐
+  (측정이 끝난 뒤에도 아직 프로파일이 켜져 있는 스레드가 있으면, 그 스레드의 다음 checkpoint()에서 끔)
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+DEFAULT_THREADS = ("capture", "processing")  # live_translate.py에서 지정한 스레드 이름
+SAMPLE_INTERVAL = 0.005  # 5ms (200Hz)
+MAX_SECONDS = 120
+
+_lock = threading.Lock()  # 동시에 하나의 프로파일만 허용
+_sessions = ()  # checkpoint()가 처리할 cProfile 세션 (측정 중 + 아직 꺼지지 않은 프로파일이 남은 세션)
+_sessions_lock = threading.Lock()
+
+
+class _ProfileSession:
+    def __init__(self, seconds, thread_names):
+        self.deadline = time.perf_counter() + seconds
+        self.thread_names = thread_names
+        self.running = {}   # thread ident -> 켜져 있는 Profile
+        self.finished = []  # 끝난 Profile 목록
+        self.skipped = set()
+        self.closed = False  # 요청 쪽이 결과를 가져간 뒤 True. 이후에는 남은 프로파일을 끄기만 함
+        self.cond = threading.Condition()
+
+    def enter(self):
+        thread = threading.current_thread()
+        if self.thread_names is not None and thread.name not in self.thread_names:
+            return
+        ident = thread.ident
+        with self.cond:
+            profile = self.running.get(ident)
+            if time.perf_counter() < self.deadline:
+                if profile is None and ident not in self.skipped:
+                    profile = cProfile.Profile()
+                    try:
+                        profile.enable()
+                    except ValueError:
+                        # Python 3.12+ (sys.monitoring): 프로파일러는 하나만 켤 수 있고, 먼저 켠 것이 모든 스레드를 측정
+                        self.skipped.add(ident)
+                        return
+                    self.running[ident] = profile
+            elif profile is not None:
+                profile.disable()
+                del self.running[ident]
+                self.finished.append(profile)
+                self.cond.notify_all()
+            if self.closed and not self.running:
+                _remove_session(self)
+
+
+def _add_session(session):
+    global _sessions
+    with _sessions_lock:
+        _sessions = _sessions + (session,)
+
+
+def _remove_session(session):
+    global _sessions
+    with _sessions_lock:
+        _sessions = tuple(s for s in _sessions if s is not session)
+
+
+def checkpoint():
+    """캡처/처리 스레드 루프의 매 반복 시작 시 호출"""
+    for session in _sessions:
+        session.enter()
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def sample_stacks(seconds, thread_names=DEFAULT_THREADS, interval=SAMPLE_INTERVAL):
+    """대상 스레드의 스택을 seconds 동안 샘플링해 collapsed stack 텍스트로 반환 (thread_names=None 이면 전체)"""
+    me = threading.get_ident()
+    counts = Counter()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            name = names.get(ident, str(ident))
+            if ident == me or (thread_names is not None and name not in thread_names):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            stack.append(name)
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+def cprofile_threads(seconds, thread_names=DEFAULT_THREADS, grace=3.0):
+    """checkpoint()를 호출하는 스레드들을 seconds 동안 cProfile로 측정해 합친 pstats.Stats 반환 (없으면 None)"""
+    session = _ProfileSession(seconds, thread_names)
+    _add_session(session)
+    try:
+        time.sleep(seconds)
+        # 각 스레드가 다음 checkpoint()에서 스스로 프로파일을 끌 때까지 잠시 대기
+        with session.cond:
+            session.cond.wait_for(lambda: not session.running, timeout=grace)
+    finally:
+        with session.cond:
+            session.closed = True
+            profiles = list(session.finished)
+            blocked = len(session.running)
+            if not session.running:
+                _remove_session(session)
+    # 대기(audio_queue.get) 또는 긴 디코딩 중인 스레드는 세션에 남겨 두고, 다음 checkpoint()에서 프로파일을 끔
+    if blocked:
+        print(f"⚠️ 프로파일 대상 스레드 {blocked}개가 아직 checkpoint()에 돌아오지 않아 결과에서 제외했습니다.")
+    if not profiles:
+        return None
+    stats = pstats.Stats(profiles[0])
+    for profile in profiles[1:]:
+        stats.add(profile)
+    return stats
+
+
+def format_stats(stats, limit=60):
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats("cumulative").print_stats(limit)
+    return stream.getvalue()
+
+
+def profile(seconds, fmt="collapsed", thread_names=DEFAULT_THREADS):
+    """(텍스트, pstats.Stats 또는 None) 반환. 다른 프로파일이 진행 중이면 RuntimeError"""
+    seconds = max(0.1, min(float(seconds), MAX_SECONDS))
+    if not _lock.acquire(blocking=False):
+        raise RuntimeError("이미 프로파일링이 진행 중입니다.")
+    try:
+        if fmt == "collapsed":
+            return sample_stacks(seconds, thread_names), None
+        if fmt == "pstats":
+            stats = cprofile_threads(seconds, thread_names)
+            if stats is None:
+                return ("No samples: 대상 스레드가 측정 구간 동안 루프를 한 바퀴도 마치지 않았습니다 "
+                        "(audio_queue 대기 또는 긴 디코딩 중). 더 긴 seconds로 다시 시도하거나 format=collapsed를 사용하세요.\n"), None
+            return format_stats(stats), stats
+        raise ValueError(f"지원하지 않는 format: {fmt}")
+    finally:
+        _lock.release()
+
+
+def _profile_when_free(seconds, fmt, thread_names, retry_interval):
+    # /debug/profile 요청이 진행 중이면 끝날 때까지 기다렸다가 측정
+    while True:
+        try:
+            return profile(seconds, fmt, thread_names)
+        except RuntimeError as e:
+            print(f"⚠️ {e} {retry_interval:.0f}초 후 다시 시도합니다.")
+            time.sleep(retry_interval)
+
+
+def profile_to_files(seconds, prefix="profile", thread_names=DEFAULT_THREADS, retry_interval=5.0):
+    """--profile 용: 샘플링 → cProfile 순서로 측정해 파일로 저장"""
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    collapsed, _ = _profile_when_free(seconds, "collapsed", thread_names, retry_interval)
+    collapsed_path = f"{prefix}_{stamp}.collapsed.txt"
+    with open(collapsed_path, "w", encoding="utf-8") as f:
+        f.write(collapsed)
+    print(f"💾 Saved {collapsed_path} (flamegraph.pl / speedscope)")
+
+    text, stats = _profile_when_free(seconds, "pstats", thread_names, retry_interval)
+    if stats is not None:
+        stats_path = f"{prefix}_{stamp}.pstats"
+        stats.dump_stats(stats_path)
+        print(f"💾 Saved {stats_path} (python -m pstats / snakeviz)")
+    print(text)
@@ -0,0 +1,92 @@
+"""
+세션 자막 전문 검색용 역색인
+
+확정된(commit) 문장이 추가될 때마다 색인을 갱신하므로, 검색 시 전체 로그를 훑지 않습니다.
+- 영어: 소문자 단어 토큰
+- 한국어: 조사가 붙어도 찾을 수 있도록 한글 음절 1-gram + 2-gram으로 색인
+  (질의는 두 음절 이상이면 2-gram, 한 음절이면 1-gram → '돈'으로 '돈을'도 찾음)
+점수는 BM25로 매깁니다.
+"""
+import math
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+
+WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?|[가-힣]+")
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text, query=False):
+    tokens = []
+    for word in WORD_RE.findall(text.lower()):
+        if "가" <= word[0] <= "힣":
+            if not query or len(word) == 1:
+                tokens.extend(word)
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+class TranscriptIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._postings = {}  # 토큰 -> ([내부 번호...], [빈도...]) (추가만 하므로 번호 오름차순)
+            self._docs = []      # 내부 번호 -> (문장 번호, 시각, 영어, 한국어)
+            self._lengths = []   # 내부 번호 -> 토큰 수
+            self._arrays = {}    # numpy 변환 캐시: 키 -> (원소 수, 배열...)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, doc_id, en, ko, ts):
+        counts = Counter(tokenize(en) + tokenize(ko))
+        with self._lock:
+            number = len(self._docs)
+            self._docs.append((doc_id, ts, en, ko))
+            self._lengths.append(sum(counts.values()))
+            for token, tf in counts.items():
+                ids, tfs = self._postings.setdefault(token, ([], []))
+                ids.append(number)
+                tfs.append(tf)
+
+    def _as_arrays(self, key, *lists):
+        # 검색 사이에 문장이 추가된 경우에만 다시 변환
+        cached = self._arrays.get(key)
+        if cached is None or cached[0] != len(lists[0]):
+            cached = (len(lists[0]),) + tuple(np.array(values) for values in lists)
+            self._arrays[key] = cached
+        return cached[1:]
+
+    def search(self, query, limit=20):
+        """[{id, ts, en, ko, score}, ...] 점수 내림차순"""
+        terms = set(tokenize(query, query=True))
+        with self._lock:
+            n_docs = len(self._docs)
+            if not terms or not n_docs:
+                return []
+            lengths, = self._as_arrays(None, self._lengths)
+            norm = K1 * (1 - B + B * lengths / max(lengths.mean(), 1.0))
+            scores = np.zeros(n_docs)
+            for term in terms:
+                if term not in self._postings:
+                    continue
+                ids, tfs = self._as_arrays(term, *self._postings[term])
+                idf = math.log(1 + (n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+                scores[ids] += idf * tfs * (K1 + 1) / (tfs + norm[ids])
+
+            matched = np.flatnonzero(scores)
+            if len(matched) > limit:
+                matched = matched[np.argpartition(-scores[matched], limit)[:limit]]
+            hits = []
+            for number in matched[np.argsort(-scores[matched], kind="stable")]:
+                doc_id, ts, en, ko = self._docs[number]
+                hits.append({"id": doc_id, "ts": ts, "en": en, "ko": ko, "score": round(float(scores[number]), 3)})
+        return hits
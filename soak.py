@@ -0,0 +1,361 @@
+"""
+장시간 세션 소크(Soak) 테스트
+
+live_translate.py의 처리 스레드와 웹 서버를 그대로 띄운 뒤, WAV 파일(또는 합성 음성+잡음)을
+가속 시간으로 계속 흘려보내며 메모리/지연 추세를 관찰합니다.
+
+    python soak.py --hours 8 --offline               # 모델/번역 없이 파이프라인+웹 서버만 (수 분 소요)
+    python soak.py --hours 1 --wav meeting.wav       # 실제 Faster-Whisper + 번역기 사용
+
+일정 간격마다 RSS, tracemalloc 상위 할당 위치(기준 시점 대비 증가분), audio_queue 깊이,
+청크 처리 지연 백분위수(p50/p95/p99), /update 응답 크기를 기록하고,
+RSS, p95 지연, /update 응답 크기 또는 /update p95 지연의 증가 기울기(오디오 1시간당)가 설정값을 넘거나, 측정값이 부족해 기울기를 계산할 수 없으면
+종료 코드 1로 실패합니다.
+"""
+import os
+
+# 환경 설정 (OpenMP 충돌 방지)
+os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
+
+import argparse
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+import tracemalloc
+import urllib.request
+
+import numpy as np
+
+import live_translate
+
+# ==========================================
+# ⚙️ 설정값
+# ==========================================
+CAPTURE_SAMPLE_RATE = 48000  # WASAPI 루프백 기본 샘플레이트 (리샘플링 경로까지 함께 검증)
+CHUNK_SECONDS = 0.5          # record_audio_loop와 동일한 0.5초 청크
+WEB_POLL_INTERVAL = 0.5      # 브라우저의 fetchLogs 주기
+TOP_ALLOCATORS = 5
+MIN_TREND_SAMPLES = 3        # 추세(기울기) 계산에 필요한 워밍업 이후 최소 측정 횟수
+TRACE_FRAMES = 25            # numpy 내부 할당을 live_translate.py 호출 위치까지 거슬러 올라가기 위한 프레임 수
+# ==========================================
+
+
+class _TimedQueue(queue.Queue):
+    """audio_queue 대체용. 청크가 들어온 시점부터 처리 스레드가 다음 청크를 가져갈 때까지를 지연으로 기록"""
+
+    def __init__(self):
+        super().__init__()
+        self.latencies = []
+        self._inflight = None
+
+    def put(self, item, block=True, timeout=None):
+        super().put((time.perf_counter(), item), block, timeout)
+
+    def get(self, block=True, timeout=None):
+        # 처리 스레드 하나만 get()을 호출하므로, 다음 get() 진입 시점 = 직전 청크 처리 완료 시점
+        if self._inflight is not None:
+            self.latencies.append(time.perf_counter() - self._inflight)
+            self._inflight = None
+        put_time, item = super().get(block, timeout)
+        self._inflight = put_time
+        return item
+
+    def take_latencies(self):
+        latencies, self.latencies = self.latencies, []
+        return latencies
+
+
+class _Segment:
+    def __init__(self, text):
+        self.text = text
+
+
+class _OfflineModel:
+    """--offline 용 모델 대체. 오디오 길이에 비례하는 문장을 즉시 돌려줌 (파이프라인 자체의 비용만 측정)"""
+
+    WORDS = "the budget review for next quarter covers hiring travel and cloud costs".split()
+
+    def transcribe(self, audio, **kwargs):
+        n_words = max(2, int(len(audio) / live_translate.SAMPLE_RATE * 2.5))
+        text = " ".join(self.WORDS[i % len(self.WORDS)] for i in range(n_words))
+        return [_Segment(text)], None
+
+
+class _OfflineTranslator:
+    class _Result:
+        def __init__(self, text):
+            self.text = text
+
+    def translate(self, text, dest="ko"):
+        return self._Result(f"[{dest}] {text}")
+
+
+def _load_wav(path):
+    import scipy.io.wavfile
+    sr, data = scipy.io.wavfile.read(path)
+    if data.ndim == 2:
+        data = data[:, 0]
+    if np.issubdtype(data.dtype, np.integer):
+        data = data.astype(np.float32) / np.iinfo(data.dtype).max
+    return data.astype(np.float32), sr
+
+
+def _synthetic_audio(seed=0):
+    """합성 발화(하모닉 + 음절 단위 진폭 변조)와 무음/잡음 구간을 번갈아 무한히 생성"""
+    rng = np.random.default_rng(seed)
+    sr = CAPTURE_SAMPLE_RATE
+    while True:
+        # 발화 2~6초
+        n = int(sr * rng.uniform(2, 6))
+        t = np.arange(n) / sr
+        pitch = rng.uniform(100, 220) * (1 + 0.05 * np.sin(2 * np.pi * 0.7 * t))
+        phase = 2 * np.pi * np.cumsum(pitch) / sr
+        voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+        envelope = 0.5 * (1 + np.sin(2 * np.pi * rng.uniform(3, 5) * t))
+        yield (0.1 * voice * envelope + 0.005 * rng.standard_normal(n)).astype(np.float32)
+
+        # 무음 1~3초 (VOLUME_THRESHOLD 미만), 가끔 잡음
+        n = int(sr * rng.uniform(1, 3))
+        level = 0.02 if rng.random() < 0.2 else 0.00001
+        yield (level * rng.standard_normal(n)).astype(np.float32)
+
+
+def _audio_chunks(wav_path):
+    """(오디오, 샘플레이트) 0.5초 청크를 무한히 생성"""
+    if wav_path:
+        data, sr = _load_wav(wav_path)
+        blocks = iter(lambda: data, None)
+    else:
+        sr = CAPTURE_SAMPLE_RATE
+        blocks = _synthetic_audio()
+
+    chunk_len = int(sr * CHUNK_SECONDS)
+    pending = np.array([], dtype=np.float32)
+    for block in blocks:
+        pending = np.concatenate((pending, block))
+        while len(pending) >= chunk_len:
+            yield pending[:chunk_len], sr
+            pending = pending[chunk_len:]
+
+
+def _rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # psutil도 /proc도 없으면 파이썬 힙 사용량으로 대신함
+    return tracemalloc.get_traced_memory()[0] / 2**20
+
+
+def _top_allocators(snapshot, baseline, limit=TOP_ALLOCATORS):
+    """기준 시점 대비 증가량 상위 할당 위치. 스택에서 가장 안쪽의 이 저장소 코드 위치로 묶음
+    (예: live_translate.py의 np.concatenate 호출 ← numpy 내부)"""
+    repo_dir = os.path.dirname(os.path.abspath(live_translate.__file__))
+    totals = {}
+    for stat in snapshot.compare_to(baseline, "traceback"):
+        frames = list(reversed(stat.traceback))  # 가장 안쪽(최근) 프레임부터
+        owner = next((f for f in frames if os.path.abspath(f.filename).startswith(repo_dir)), frames[0])
+        key = str(owner) if owner is frames[0] else f"{owner} ← {frames[0]}"
+        totals[key] = totals.get(key, 0) + stat.size_diff
+    top = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [f"{where}: {size / 1024:+.1f} KiB" for where, size in top]
+
+
+def _percentiles(values):
+    if not values:
+        return {"p50": None, "p95": None, "p99": None}
+    p50, p95, p99 = np.percentile(np.array(values) * 1000, [50, 95, 99])
+    return {"p50": round(float(p50), 2), "p95": round(float(p95), 2), "p99": round(float(p99), 2)}
+
+
+def _slope_per_hour(samples, key, warmup):
+    """오디오 시간(시) 대비 key 값의 선형회귀 기울기. warmup 비율만큼 앞부분은 제외"""
+    points = [(s["audio_hours"], s[key]) for s in samples[int(len(samples) * warmup):] if s[key] is not None]
+    if len(points) < MIN_TREND_SAMPLES:
+        return None
+    x, y = np.array(points).T
+    if np.ptp(x) == 0:
+        return None
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def _poll_web(port, stats, stop_event):
+    """브라우저처럼 /update를 주기적으로 호출하며 응답 크기와 지연을 기록"""
+    url = f"http://127.0.0.1:{port}/update"
+    while not stop_event.is_set():
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, timeout=10) as resp:
+                body = resp.read()
+            stats["latencies"].append(time.perf_counter() - start)
+            stats["payload_bytes"] = len(body)
+            stats["logs"] = len(json.loads(body)["logs"])
+        except Exception as e:
+            stats["errors"] += 1
+            print(f"❌ /update 호출 실패: {e}")
+        stop_event.wait(WEB_POLL_INTERVAL)
+
+
+def run_soak(args):
+    if args.offline:
+        model = _OfflineModel()
+        live_translate.translator = _OfflineTranslator()
+    else:
+        print("Loading Faster-Whisper model...")
+        model = live_translate.WhisperModel(live_translate.MODEL_SIZE, device="cpu", compute_type="int8")
+
+    timed_queue = _TimedQueue()
+    live_translate.audio_queue = timed_queue
+
+    # 폴링마다 찍히는 werkzeug 접근 로그는 끔
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    threading.Thread(target=live_translate.app.run,
+                     kwargs={"host": "127.0.0.1", "port": args.port, "debug": False, "use_reloader": False},
+                     daemon=True).start()
+    threading.Thread(target=live_translate.process_audio_loop, args=(model,), name="processing", daemon=True).start()
+
+    stop_event = threading.Event()
+    web_stats = {"latencies": [], "payload_bytes": 0, "logs": 0, "errors": 0}
+    time.sleep(1.0)  # 서버 기동 대기
+    threading.Thread(target=_poll_web, args=(args.port, web_stats, stop_event), daemon=True).start()
+
+    tracemalloc.start(TRACE_FRAMES)
+    # 측정 도구 자신(합성 오디오 생성, tracemalloc)과 import 할당은 제외하고 파이프라인 할당만 봄
+    snapshot_filters = [tracemalloc.Filter(False, tracemalloc.__file__, all_frames=True),
+                        tracemalloc.Filter(False, __file__, all_frames=True),
+                        tracemalloc.Filter(False, "<frozen importlib._bootstrap>", all_frames=True),
+                        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>", all_frames=True)]
+    baseline = tracemalloc.take_snapshot().filter_traces(snapshot_filters)
+
+    target_audio_seconds = args.hours * 3600
+    fed_seconds = 0.0
+    samples = []
+    wall_start = time.perf_counter()
+    next_sample = wall_start + args.interval
+    print(f"🧪 Soak test: {args.hours}h of audio, speed={'max' if args.speed <= 0 else f'x{args.speed}'}, "
+          f"interval={args.interval}s")
+
+    chunks = _audio_chunks(args.wav)
+    while fed_seconds < target_audio_seconds:
+        audio, sr = next(chunks)
+        if args.speed > 0:
+            # 가속 실시간: 청크를 CHUNK_SECONDS / speed 간격으로 넣음 (처리가 못 따라가면 큐가 쌓임)
+            due = wall_start + fed_seconds / args.speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        else:
+            # 최대 속도: 처리 스레드가 소화하는 만큼만 넣음
+            while timed_queue.qsize() > 1:
+                time.sleep(0.001)
+        timed_queue.put((audio, sr, time.time()))
+        fed_seconds += len(audio) / sr
+
+        now = time.perf_counter()
+        if now >= next_sample or fed_seconds >= target_audio_seconds:
+            next_sample = now + args.interval
+            snapshot = tracemalloc.take_snapshot().filter_traces(snapshot_filters)
+            sample = {
+                "wall_seconds": round(now - wall_start, 1),
+                "audio_hours": round(fed_seconds / 3600, 4),
+                "rss_mb": round(_rss_mb(), 2),
+                "traced_mb": round(tracemalloc.get_traced_memory()[0] / 2**20, 2),
+                "queue_depth": timed_queue.qsize(),
+                "latency_ms": _percentiles(timed_queue.take_latencies()),
+                "web_latency_ms": _percentiles(web_stats["latencies"]),
+                "web_payload_kb": round(web_stats["payload_bytes"] / 1024, 1),
+                "logs": web_stats["logs"],
+                "top_allocators": _top_allocators(snapshot, baseline),
+            }
+            web_stats["latencies"] = []
+            sample["p95_ms"] = sample["latency_ms"]["p95"]
+            sample["web_p95_ms"] = sample["web_latency_ms"]["p95"]
+            samples.append(sample)
+            print(f"[soak] {sample['audio_hours']:.2f}h audio / {sample['wall_seconds']:.0f}s wall | "
+                  f"RSS {sample['rss_mb']:.1f}MB | queue {sample['queue_depth']} | "
+                  f"latency p50/p95/p99 {sample['latency_ms']['p50']}/{sample['latency_ms']['p95']}/"
+                  f"{sample['latency_ms']['p99']}ms | logs {sample['logs']} ({sample['web_payload_kb']}KB)")
+            for line in sample["top_allocators"]:
+                print(f"        {line}")
+
+    stop_event.set()
+
+    rss_slope = _slope_per_hour(samples, "rss_mb", args.warmup)
+    latency_slope = _slope_per_hour(samples, "p95_ms", args.warmup)
+    # 확정 로그가 늘수록 /update가 매번 전체를 다시 보내므로, 응답 크기와 웹 지연의 추세도 함께 확인
+    payload_slope = _slope_per_hour(samples, "web_payload_kb", args.warmup)
+    web_latency_slope = _slope_per_hour(samples, "web_p95_ms", args.warmup)
+    failures = []
+    for name, slope, limit, unit in (("RSS", rss_slope, args.max_rss_slope, "MB/h"),
+                                     ("p95 latency", latency_slope, args.max_latency_slope, "ms/h"),
+                                     ("/update payload", payload_slope, args.max_payload_slope, "KB/h"),
+                                     ("/update p95 latency", web_latency_slope, args.max_web_latency_slope, "ms/h")):
+        if slope is None:
+            # 추세를 알 수 없으면 통과로 보지 않음 (너무 짧은 실행)
+            failures.append(f"{name} 추세를 계산할 수 없습니다: 워밍업 이후 측정값이 {MIN_TREND_SAMPLES}개 미만 "
+                            f"(--hours를 늘리거나 --interval을 줄이세요)")
+        elif slope > limit:
+            failures.append(f"{name} {slope:+.2f} {unit} > {limit} {unit}")
+    if web_stats["errors"]:
+        failures.append(f"/update errors: {web_stats['errors']}")
+
+    report = {
+        "args": vars(args),
+        "rss_slope_mb_per_hour": rss_slope,
+        "p95_latency_slope_ms_per_hour": latency_slope,
+        "web_payload_slope_kb_per_hour": payload_slope,
+        "web_p95_latency_slope_ms_per_hour": web_latency_slope,
+        "failures": failures,
+        "samples": samples,
+    }
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 Saved {args.report}")
+
+    fmt = lambda v: "n/a" if v is None else f"{v:+.2f}"
+    print(f"📈 RSS slope: {fmt(rss_slope)} MB/h, p95 latency slope: {fmt(latency_slope)} ms/h, "
+          f"/update payload slope: {fmt(payload_slope)} KB/h, /update p95 latency slope: {fmt(web_latency_slope)} ms/h")
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        return 1
+    print("✅ Soak test passed.")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="LiveTalk-KoEn long-running soak test")
+    parser.add_argument("--hours", type=float, default=8.0, help="재생할 오디오 길이 (시간)")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="실시간 대비 배속. 0이면 처리 스레드가 소화하는 최대 속도")
+    parser.add_argument("--wav", help="반복 재생할 WAV 파일 (없으면 합성 음성+잡음)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Whisper/구글 번역 대신 즉시 응답하는 대체 객체 사용 (파이프라인+웹 서버 비용만 측정)")
+    parser.add_argument("--interval", type=float, default=10.0, help="측정 간격 (초, 실제 시간)")
+    parser.add_argument("--warmup", type=float, default=0.1, help="추세 계산에서 제외할 앞부분 비율")
+    parser.add_argument("--max-rss-slope", type=float, default=20.0, help="허용 RSS 증가 기울기 (MB / 오디오 1시간)")
+    parser.add_argument("--max-latency-slope", type=float, default=100.0,
+                        help="허용 p95 지연 증가 기울기 (ms / 오디오 1시간)")
+    parser.add_argument("--max-payload-slope", type=float, default=50.0,
+                        help="허용 /update 응답 크기 증가 기울기 (KB / 오디오 1시간)")
+    parser.add_argument("--max-web-latency-slope", type=float, default=50.0,
+                        help="허용 /update p95 지연 증가 기울기 (ms / 오디오 1시간)")
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--report", default="soak_report.json", help="측정 결과 JSON 저장 경로")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(run_soak(parse_args()))
@@ -0,0 +1,145 @@
+"""
+원격 수집 경로 루프백 테스트
+
+로컬에서 live_translate.py의 웹 서버를 띄우고, WAV 파일을 /ingest 로 스트리밍해
+audio_queue에 같은 오디오가 그대로 들어오는지 확인합니다. (모델/캡처 장치 불필요)
+잘못된 프레임(샘플레이트 0, 빈/홀수 길이 페이로드 등)은 400으로 거부되는지,
+로컬 캡처 중이거나 다른 스트림이 이미 연결된 경우 409로 거부되고 끝없는 스트림도 바로 끊기는지 확인합니다.
+
+    python test_ingest.py [meeting.wav]
+"""
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+
+import numpy as np
+import scipy.io.wavfile
+from werkzeug.serving import make_server
+
+import ingest
+import live_translate
+
+
+def _write_test_wav(path, sample_rate=48000, seconds=3.2):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    audio = 0.3 * np.sin(2 * np.pi * 220 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    scipy.io.wavfile.write(path, sample_rate, (audio * 32767).astype(np.int16))
+
+
+def _start_server():
+    server = make_server("127.0.0.1", 0, live_translate.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/ingest"
+
+
+def _endless_frames():
+    # capture_client 처럼 끝나지 않는 스트림
+    while True:
+        yield ingest.pack_frame(np.zeros(8000, dtype=np.float32), 16000)
+        time.sleep(0.05)
+
+
+def test_ingest_loopback(wav_path=None):
+    with tempfile.TemporaryDirectory() as tmp:
+        if wav_path is None:
+            wav_path = os.path.join(tmp, "ingest_test.wav")
+            _write_test_wav(wav_path)
+        sample_rate, expected = scipy.io.wavfile.read(wav_path)
+        if expected.ndim == 2:
+            expected = expected[:, 0]
+        if np.issubdtype(expected.dtype, np.integer):
+            expected = expected.astype(np.float32) / np.iinfo(expected.dtype).max
+
+        live_translate.audio_queue = queue.Queue()
+        server, url = _start_server()
+        try:
+            for codec, tolerance in ((ingest.CODEC_S16, 2 / 32767), (ingest.CODEC_F32, 1e-6)):
+                response = ingest.stream_audio(url, ingest.wav_frames(wav_path, codec=codec))
+
+                received = []
+                while not live_translate.audio_queue.empty():
+                    audio_array, rate, _ = live_translate.audio_queue.get_nowait()
+                    assert rate == sample_rate
+                    received.append(audio_array)
+                received = np.concatenate(received)
+
+                assert b'"frames":' in response
+                assert len(received) == len(expected)
+                assert np.abs(received - expected).max() <= tolerance
+                print(f"✅ codec={codec}: {len(received)} samples @ {sample_rate}Hz, "
+                      f"max error {np.abs(received - expected).max():.2e}")
+        finally:
+            server.shutdown()
+
+
+def test_ingest_rejected():
+    # 잘못된 프레임(샘플레이트 0, 빈/홀수 길이 페이로드 등)은 400으로 거부되고, 로컬 캡처 중이거나 다른 스트림이 연결되어 있으면 409. 끝없는 스트림도 멈춰 있지 않고 바로 끊겨야 함
+    live_translate.audio_queue = queue.Queue()
+    server, url = _start_server()
+    try:
+        for reason in ("local_capture", "second_stream"):
+            if reason == "local_capture":
+                live_translate.local_capture_active = True
+            else:
+                live_translate.ingest_lock.acquire()
+            try:
+                try:
+                    ingest.check_server(url)
+                    raise AssertionError("check_server should be rejected")
+                except urllib.error.HTTPError as e:
+                    assert e.code == 409
+                    message = ingest.error_text(e)
+                    assert message
+
+                errors = []
+                sender = threading.Thread(target=lambda: errors.append(_stream_error(url)), daemon=True)
+                sender.start()
+                sender.join(timeout=10)
+                assert not sender.is_alive(), "rejected stream kept sending"
+                assert errors[0] is not None
+                assert live_translate.audio_queue.empty()
+                print(f"✅ rejected ({reason}): {message} / stream: {type(errors[0]).__name__}")
+            finally:
+                live_translate.local_capture_active = False
+                if reason == "second_stream":
+                    live_translate.ingest_lock.release()
+    finally:
+        server.shutdown()
+
+
+def test_ingest_malformed_frames():
+    # 네트워크에서 온 잘못된 프레임은 400으로 거부하고 audio_queue에는 넣지 않음 (처리 스레드 보호)
+    good = ingest.pack_frame(np.zeros(8000, dtype=np.float32), 16000)
+    cases = {
+        "rate=0": ingest.FRAME_HEADER.pack(ingest.MAGIC, ingest.CODEC_S16, 0, time.time(), 4) + bytes(4),
+        "rate=1MHz": ingest.FRAME_HEADER.pack(ingest.MAGIC, ingest.CODEC_S16, 1000000, time.time(), 4) + bytes(4),
+        "empty": ingest.FRAME_HEADER.pack(ingest.MAGIC, ingest.CODEC_S16, 16000, time.time(), 0),
+        "odd s16": ingest.FRAME_HEADER.pack(ingest.MAGIC, ingest.CODEC_S16, 16000, time.time(), 3) + bytes(3),
+        "f32 not x4": ingest.FRAME_HEADER.pack(ingest.MAGIC, ingest.CODEC_F32, 16000, time.time(), 6) + bytes(6),
+    }
+    client = live_translate.app.test_client()
+    for name, frame in cases.items():
+        live_translate.audio_queue = queue.Queue()
+        response = client.post("/ingest", data=good + frame)
+        assert response.status_code == 400, (name, response.status_code)
+        assert response.get_json()["frames"] == 1
+        assert live_translate.audio_queue.qsize() == 1  # 앞의 정상 프레임만
+        print(f"✅ malformed ({name}): {response.get_json()['error']}")
+
+
+def _stream_error(url):
+    try:
+        ingest.stream_audio(url, _endless_frames())
+    except Exception as e:
+        return e
+    return None
+
+
+if __name__ == "__main__":
+    test_ingest_loopback(sys.argv[1] if len(sys.argv) > 1 else None)
+    test_ingest_rejected()
+    test_ingest_malformed_frames()
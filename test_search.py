@@ -0,0 +1,37 @@
+"""
+자막 검색 색인 테스트 (모델/서버 불필요)
+
+    python test_search.py
+"""
+from search_index import TranscriptIndex
+
+
+def _index(*lines):
+    index = TranscriptIndex()
+    for i, (en, ko) in enumerate(lines):
+        index.add(i, en, ko, 1700000000 + i)
+    return index
+
+
+def test_search_korean_one_syllable():
+    # 한 음절 명사 + 조사 ("돈을", "예산은")도 한 음절 질의로 찾아야 함
+    index = _index(("we are short on money", "우리는 돈을 더 써야 합니다"),
+                   ("the budget is fixed", "예산은 고정입니다"),
+                   ("see you tomorrow", "내일 봅시다"))
+    for query, expected in (("돈", 0), ("예", 1), ("돈을", 0), ("예산", 1), ("budget", 1)):
+        hits = index.search(query)
+        assert hits and hits[0]["id"] == expected, (query, hits)
+        print(f"✅ {query!r} -> {hits[0]['ko']}")
+
+
+def test_search_ranks_bigram_match_first():
+    # 여러 음절 질의는 2-gram으로 찾으므로, 같은 음절이 흩어져 있기만 한 문장은 매칭되지 않음
+    index = _index(("a", "산에 가서 예를 들면"), ("b", "이번 분기 예산 검토"))
+    hits = index.search("예산")
+    assert [hit["id"] for hit in hits] == [1], hits
+    print(f"✅ '예산' -> {hits[0]['ko']} ({len(hits)} hit)")
+
+
+if __name__ == "__main__":
+    test_search_korean_one_syllable()
+    test_search_ranks_bigram_match_first()